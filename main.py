@@ -1,8 +1,8 @@
 import streamlit as st
-import google.generativeai as genai
-from fpdf import FPDF
 import os
+import threading
 from dotenv import load_dotenv
+from pdf_utils import DEFAULT_AUTHORS, create_pdf, normalize_inputs, slug
 
 
 st.set_page_config(page_title="Abstract PDF Generator")
@@ -31,42 +31,63 @@ st.markdown("""
     }
 </style>
 """, unsafe_allow_html=True)
-# Load environment variables
-load_dotenv()
 
-# Configure API key
-def configure_api():
-    """Configure the API key from environment variables, secrets, or user input"""
+@st.cache_resource
+def _genai_state():
+    """Process-wide record of the key genai is configured with (survives reruns)"""
+    return {"key_hash": None, "lock": threading.Lock()}
+
+@st.cache_resource
+def _default_api_key():
+    """Read the API key from Streamlit secrets or the environment once per process"""
+    # Load environment variables
+    load_dotenv()
+    try:
+        # Try getting from Streamlit secrets
+        return st.secrets["GEMINI_API_KEY"]
+    except:
+        # Fallback to environment variable
+        return os.getenv("GEMINI_API_KEY")
+
+def get_api_key():
+    """Get the API key from user input, secrets, or environment variables"""
     # Try getting from user input in session state first
     if 'user_api_key' in st.session_state and st.session_state.user_api_key:
-        api_key = st.session_state.user_api_key
-    else:
-        try:
-            # Try getting from Streamlit secrets
-            api_key = st.secrets["GEMINI_API_KEY"]
-        except:
-            # Fallback to environment variable
-            api_key = os.getenv("GEMINI_API_KEY")
+        return st.session_state.user_api_key
+    return _default_api_key()
+
+# Configure API key
+def configure_api():
+    """Configure the Gemini SDK with the current API key (imports it on first use)
+
+    genai's default client is process-wide, so callers must hold
+    _genai_state()["lock"] from this call until their request has been sent;
+    otherwise another session could switch keys in between. Skipping
+    genai.configure for an unchanged key relies on models being built per call.
+    """
+    # Imported lazily: the SDK is slow to import and only the AI tab needs it
+    import google.generativeai as genai
     
+    api_key = get_api_key()
     if api_key:
-        genai.configure(api_key=api_key)
+        state = _genai_state()
+        key_hash = hash(api_key)
+        if state["key_hash"] != key_hash:
+            genai.configure(api_key=api_key)
+            state["key_hash"] = key_hash
         return True
     return False
 
-class PDF(FPDF):
-    def __init__(self):
-        super().__init__()
-        self.set_margins(25.4, 12, 25.4)
-        self.set_auto_page_break(auto=True, margin=25.4)
-        
-    def header(self):
-        pass
-    
-    def footer(self):
-        pass
+# Passed explicitly to generate_ai_abstract so it is part of the cache key;
+# bump it to discard cached abstracts without editing the prompt
+PROMPT_VERSION = 1
 
-def generate_ai_abstract(title):
+@st.cache_data(ttl=24*3600, show_spinner=False)
+def generate_ai_abstract(title, prompt_version):
     """Generate abstract using Gemini AI"""
+    import google.generativeai as genai
+    # Built per call: a model binds genai's default client on first use, so a
+    # shared instance would keep using whichever API key was configured first
     model = genai.GenerativeModel('gemini-pro')
     
     prompt = f"""Generate a single paragraph abstract for a research paper titled "{title}".
@@ -86,51 +107,6 @@ def generate_ai_abstract(title):
     response = model.generate_content(prompt)
     return response.text
 
-def create_pdf(title, abstract, authors):
-    """Create PDF with given title, abstract, and authors"""
-    pdf = PDF()
-    pdf.add_page()
-    
-    line_height = 7.5
-    
-    # Function to replace unsupported characters
-    def sanitize_text(text):
-        return text.encode('latin1', 'replace').decode('latin1')
-    
-    # Title
-    pdf.set_font('Times', 'B', 14)
-    pdf.cell(0, line_height, txt=sanitize_text(title.upper()), ln=True, align='C')
-    pdf.ln(2)
-    
-    # Abstract header
-    pdf.set_font('Times', 'B', 12)
-    pdf.cell(0, line_height, txt="Abstract", ln=True, align='C')
-    pdf.ln(2)
-    
-    # Abstract content
-    pdf.set_font('Times', '', 12)
-    abstract = sanitize_text(' '.join(abstract.split()))
-    pdf.multi_cell(0, line_height, txt=abstract, align='J')
-    
-    pdf.ln(10)
-    
-    # Authors section
-    pdf.set_font('Times', '', 12)
-    max_width = 0
-    lines = ["Prepared By,"] + [sanitize_text(author.strip()) + "," for author in authors if author.strip()]
-    
-    for line in lines:
-        width = pdf.get_string_width(line)
-        max_width = max(max_width, width)
-    
-    x_position = pdf.w - pdf.r_margin - max_width
-    
-    for line in lines:
-        pdf.set_x(x_position)
-        pdf.cell(max_width, line_height, txt=line, ln=True, align='L')
-    
-    return pdf.output(dest='S').encode('latin1')
-
 
 def main():
     st.title("Abstract PDF Generator")
@@ -152,89 +128,96 @@ def main():
         else:
             st.session_state.user_api_key = None
     
-    # Configure API
-    api_configured = configure_api()
-    if not api_configured:
+    # Check an API key is available; the SDK itself is configured on first AI use
+    if not get_api_key():
         st.error("API configuration error. Please contact the administrator or use your own API key.")
         return
     
-    # Input fields
-    title = st.text_input("Document Title", "")
-    
-    # Default authors
-    default_authors = [
-        "Adithya Raj",
-        "Lidiya Reju",
-        "Jibin Gigi",
-        "Manu Emmanuel",
-        "S6 CS A"
-    ]
-    
-    # Author inputs
-    st.subheader("Authors")
-    authors = []
-    for i, default_author in enumerate(default_authors):
-        author = st.text_input(f"Author {i+1}", value=default_author)
-        authors.append(author)
-    
-    # Add tabs for different abstract input methods
-    tab1, tab2 = st.tabs(["Manual Input", "AI Generated"])
-    
-    with tab1:
-        abstract = st.text_area("Abstract", "", height=200)
-        if st.button("Generate PDF"):
-            if title and abstract and any(authors):
-                try:
-                    pdf_bytes = create_pdf(title, abstract, authors)
-                    st.download_button(
-                        label="Download PDF",
-                        data=pdf_bytes,
-                        file_name=f"{title.lower().replace(' ', '_')}.pdf",
-                        mime="application/pdf"
-                    )
-                    st.success("PDF generated successfully!")
-                except Exception as e:
-                    st.error(f"An error occurred: {str(e)}")
-            else:
-                st.warning("Please fill in all required fields (Title, Abstract, and at least one Author).")
+    # Input fields, batched in a form so typing does not rerun the script
+    with st.form("pdf_inputs"):
+        title = st.text_input("Document Title", "")
+        
+        # Author inputs
+        st.subheader("Authors")
+        authors = []
+        for i, default_author in enumerate(DEFAULT_AUTHORS, 1):
+            author = st.text_input(f"Author {i}", value=default_author)
+            authors.append(author)
+        
+        # Add tabs for different abstract input methods
+        tab1, tab2 = st.tabs(["Manual Input", "AI Generated"])
+        
+        with tab1:
+            abstract = st.text_area("Abstract", "", height=200)
+            submitted = st.form_submit_button("Generate PDF")
+        
+        with tab2:
+            generate_button = st.form_submit_button("Generate with AI")
+    
+    # Download buttons are not allowed inside a form, so results render below it
+    if submitted:
+        # Normalize first so whitespace-only fields fail validation before rendering
+        inputs = normalize_inputs(title, abstract, authors)
+        if all(inputs):
+            try:
+                pdf_bytes = create_pdf(*inputs)
+                st.download_button(
+                    label="Download PDF",
+                    data=pdf_bytes,
+                    file_name=f"{slug(title.strip())}.pdf",
+                    mime="application/pdf"
+                )
+                st.success("PDF generated successfully!")
+            except Exception as e:
+                st.error(f"An error occurred: {str(e)}")
+        else:
+            st.warning("Please fill in all required fields (Title, Abstract, and at least one Author).")
     
-    with tab2:
-        generate_button = st.button("Generate with AI")
-        if generate_button:
-            if not title:
-                st.warning("Please enter a title first.")
+    if generate_button:
+        if not title.strip():
+            st.warning("Please enter a title first.")
+        else:
+            try:
+                with st.spinner("Generating abstract..."):
+                    # Hold the lock through the request so it is sent with this session's key
+                    with _genai_state()["lock"]:
+                        configure_api()
+                        generated_abstract = generate_ai_abstract(title.strip(), PROMPT_VERSION)
+                    # Render the PDF only here, so later reruns (e.g. the TXT download) reuse it
+                    inputs = normalize_inputs(title, generated_abstract, authors)
+                    pdf_bytes = create_pdf(*inputs) if all(inputs) else None
+                    st.session_state.generated_abstract = generated_abstract
+                    st.session_state.ai_title = title.strip()
+                    st.session_state.ai_pdf_bytes = pdf_bytes
+            except Exception as e:
+                st.error(f"Error generating abstract: {str(e)}")
+    
+    if st.session_state.get('generated_abstract'):
+        generated_abstract = st.session_state.generated_abstract
+        ai_title = st.session_state.ai_title
+        st.text_area("Generated Abstract", generated_abstract, height=200)
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            # Download abstract as text
+            st.download_button(
+                label="Download Abstract as TXT",
+                data=generated_abstract,
+                file_name=f"{slug(ai_title)}_abstract.txt",
+                mime="text/plain"
+            )
+        
+        with col2:
+            # Download as PDF
+            if st.session_state.ai_pdf_bytes:
+                st.download_button(
+                    label="Download as PDF",
+                    data=st.session_state.ai_pdf_bytes,
+                    file_name=f"{slug(ai_title)}.pdf",
+                    mime="application/pdf"
+                )
             else:
-                try:
-                    with st.spinner("Generating abstract..."):
-                        generated_abstract = generate_ai_abstract(title)
-                        st.session_state.generated_abstract = generated_abstract
-                        st.text_area("Generated Abstract", generated_abstract, height=200)
-                        
-                        col1, col2 = st.columns(2)
-                        with col1:
-                            # Download abstract as text
-                            st.download_button(
-                                label="Download Abstract as TXT",
-                                data=generated_abstract,
-                                file_name=f"{title.lower().replace(' ', '_')}_abstract.txt",
-                                mime="text/plain"
-                            )
-                        
-                        with col2:
-                            # Download as PDF
-                            if any(authors):
-                                pdf_bytes = create_pdf(title, generated_abstract, authors)
-                                st.download_button(
-                                    label="Download as PDF",
-                                    data=pdf_bytes,
-                                    file_name=f"{title.lower().replace(' ', '_')}.pdf",
-                                    mime="application/pdf"
-                                )
-                            else:
-                                st.warning("Please fill in at least one author for PDF generation.")
-                                
-                except Exception as e:
-                    st.error(f"Error generating abstract: {str(e)}")
+                st.warning("Please fill in at least one author for PDF generation.")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,90 @@
+"""PDF layout and rendering for the abstract generator"""
+import functools
+import io
+from xml.sax.saxutils import escape
+
+import streamlit as st
+from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY, TA_LEFT
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.lib.units import mm
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer
+
+# Page layout (Times on A4 with 1 inch side margins)
+LINE_HEIGHT = 7.5 * mm
+TITLE_STYLE = ParagraphStyle('Title', fontName='Times-Bold', fontSize=14, leading=LINE_HEIGHT,
+                             alignment=TA_CENTER, spaceAfter=2 * mm)
+HEADING_STYLE = ParagraphStyle('Heading', parent=TITLE_STYLE, fontSize=12)
+BODY_STYLE = ParagraphStyle('Body', fontName='Times-Roman', fontSize=12, leading=LINE_HEIGHT,
+                            alignment=TA_JUSTIFY)
+
+# Default authors
+DEFAULT_AUTHORS = (
+    "Adithya Raj",
+    "Lidiya Reju",
+    "Jibin Gigi",
+    "Manu Emmanuel",
+    "S6 CS A",
+)
+
+# Spaces and characters not allowed in file names become underscores
+_SLUG_TABLE = str.maketrans({c: '_' for c in ' /\\:*?"<>|'})
+
+@functools.lru_cache(maxsize=64)
+def slug(title):
+    """File-name stem for a document title"""
+    return title.lower().translate(_SLUG_TABLE)
+
+def normalize_inputs(title, abstract, authors):
+    """Normalize raw inputs so equivalent ones share a create_pdf cache entry"""
+    return (
+        title.strip().upper(),
+        ' '.join(abstract.split()),
+        tuple(a.strip() for a in authors if a.strip()),
+    )
+
+@st.cache_data(ttl=3600, max_entries=128, show_spinner=False)
+def create_pdf(title, abstract, authors):
+    """Create PDF from inputs already normalized by normalize_inputs"""
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4, leftMargin=25.4 * mm, rightMargin=25.4 * mm,
+                            topMargin=12 * mm, bottomMargin=25.4 * mm)
+    
+    # Function to replace characters the core Times font cannot draw
+    def to_latin1(text):
+        # ASCII text is already latin1-safe, so skip the encode/decode round trip
+        if text.isascii():
+            return text
+        return text.encode('latin1', 'replace').decode('latin1')
+    
+    # Function to also escape Paragraph markup
+    def sanitize_text(text):
+        return escape(to_latin1(text))
+    
+    # Title and abstract header
+    story = [
+        Paragraph(sanitize_text(title), TITLE_STYLE),
+        Paragraph("Abstract", HEADING_STYLE),
+    ]
+    
+    # Abstract content
+    story.append(Paragraph(sanitize_text(abstract), BODY_STYLE))
+    
+    story.append(Spacer(0, 10 * mm))
+    
+    # Authors section, left-aligned as a block against the right margin
+    # Measure the text as drawn, i.e. after unsupported characters become '?'
+    lines = ("Prepared By,",) + tuple(to_latin1(author) + "," for author in authors)
+    max_width = max(stringWidth(line, BODY_STYLE.fontName, BODY_STYLE.fontSize) for line in lines)
+    # The document frame pads its content by 6pt on each side
+    frame_width = doc.width - 12
+    # Leave 0.5pt of slack: rounding in the subtraction can make the wrap width a
+    # hair narrower than max_width, which would push a trailing comma onto its own line
+    authors_style = ParagraphStyle('Authors', parent=BODY_STYLE, alignment=TA_LEFT,
+                                   leftIndent=max(frame_width - max_width - 0.5, 0),
+                                   splitLongWords=0)
+    story.append(Paragraph("<br/>".join(escape(line) for line in lines), authors_style))
+    
+    doc.build(story)
+    return buffer.getvalue()